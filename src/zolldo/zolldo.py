@@ -1,16 +1,49 @@
 #!/usr/bin/env python3
 
 import argparse
-import json
+import bisect
+import functools
+import itertools
+import mmap
 import os
-import platform
-import tkinter as tk
-from datetime import datetime
-from tkinter import ttk, messagebox
-from typing import Any, Optional, TypedDict
+import pickle
+import re
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
+try:
+  import orjson
 
-class Task(TypedDict):
+  _dumps = orjson.dumps
+  _loads = orjson.loads
+except ImportError:  # orjson is much faster, but the stdlib keeps zolldo working without it
+  import json
+
+  def _dumps(obj) -> bytes:
+    '''Serializes an object to JSON bytes.'''
+    return json.dumps(obj).encode()
+
+  def _loads(data):
+    '''Parses JSON from a bytes-like object.'''
+    return json.loads(bytes(data))
+
+
+# cheap prevalidators for user input: rejecting a typo with a regex scan avoids
+# datetime.fromisoformat's (or int's) parse-then-raise machinery
+# _ISO_RE checks only a necessary condition (4-digit year, plausible length) so every string
+# fromisoformat accepts still reaches it; the real grammar check stays with fromisoformat
+_ISO_RE = re.compile(r'^\d{4}.{3,44}$')
+_ID_RE = re.compile(r'^[1-9]\d*$')
+
+# swaps the 0 and 1 bytes of the completed column, for filtering on uncompleted
+_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+@dataclass(slots=True)
+class Task:
   title: str
   due_date: datetime
   completed: bool
@@ -19,34 +52,263 @@ class Task(TypedDict):
 
 class TaskManager:
   def __init__(self):
-    '''Loads tasks from file.'''
-    self.task_dict: dict[int, Task] = {}
+    '''Sets up empty state. Tasks are loaded from file lazily, the first time something reads or mutates them.'''
+    # tasks are stored struct-of-arrays: one contiguous column per field plus an id -> row-index map,
+    # so filtering and sorting scan a single column instead of chasing a dict pointer per task
+    self._ids: list[int] = []
+    self._titles: list[str] = []
+    self._dues: list[datetime] = []
+    self._completed = bytearray()
+    self._descs: list[str] = []
+    self._idx: dict[int, int] = {}
+    # sort orders maintained incrementally via bisect, so list_tasks never has to re-sort
+    self._by_title: list[tuple[str, int]] = []
+    self._by_due: list[tuple[datetime, int]] = []
     self.max_id = 0
+    self._version = 0  # bumped on every mutation; used as a cache key by list_tasks_cached
+    self._flush_timer: Optional[threading.Timer] = None
+    self._flush_lock = threading.Lock()
 
     self.script_dir = os.path.dirname(os.path.abspath(__file__))
     self.todo_filename = os.path.join(self.script_dir, "todo.json")
-    
-    if os.path.exists(self.todo_filename):
-      with open(self.todo_filename, "r") as file:
-        self.task_dict = json.load(file)
-        self.task_dict = {int(k): v for k, v in self.task_dict.items()}  # use ints rather than strs as keys
-        for task in self.task_dict.values():
-          task["due_date"] = datetime.fromisoformat(task["due_date"])  # convert ISO strings to datetimes
+    self.journal_filename = self.todo_filename + ".log"
+    self.cache_filename = self.todo_filename + ".cache"
+    self._loaded = False
+    self._journal = None
+
+  def _ensure_loaded(self) -> None:
+    '''Loads tasks from file on first use, so commands that never touch the tasks (e.g. --help) skip the disk entirely.'''
+    if self._loaded:
+      return
+    self._loaded = True
+    if os.path.exists(self.todo_filename) and os.path.getsize(self.todo_filename) > 0:
+      stat = os.stat(self.todo_filename)
+      stamp = (stat.st_mtime_ns, stat.st_size)
+      if not self._read_cache(stamp):
+        with open(self.todo_filename, "rb") as file:
+          with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            raw = _loads(memoryview(mapped))  # orjson parses the mapped bytes directly, no intermediate copy
+        if isinstance(raw, dict):  # legacy snapshots were objects, whose keys JSON forces to strings
+          raw = [(int(key), encoded) for key, encoded in raw.items()]
+        for id, encoded in raw:
+          self._set_row(id, self._decode_task(encoded))
+          if id > self.max_id:
+            self.max_id = id
+        try:
+          self._write_cache(stamp)
+        except OSError:
+          pass  # a read-only install still works, it just reparses the snapshot each time
+    self._replay_journal()
+    # the journal handle is opened lazily by _append, so read-only commands never need write access
+
+  def _read_cache(self, stamp: tuple[int, int]) -> bool:
+    '''Restores the parsed snapshot from the pickle cache. Returns False if the cache is missing, stale, or unreadable.'''
+    try:
+      with open(self.cache_filename, "rb") as file:
+        cached_stamp, state = pickle.load(file)
+      if cached_stamp != stamp:
+        return False
+      (self._ids, self._titles, self._dues, self._completed, self._descs,
+       self._idx, self._by_title, self._by_due, self.max_id) = state
+    except Exception:  # the cache is best effort: anything unreadable or wrong-shaped is a miss
+      return False
+    return True
+
+  def _write_cache(self, stamp: tuple[int, int]) -> None:
+    '''Pickles the freshly parsed snapshot keyed by the snapshot file's stat, so the next load can unpickle instead of reparsing JSON.'''
+    state = (self._ids, self._titles, self._dues, self._completed, self._descs,
+             self._idx, self._by_title, self._by_due, self.max_id)
+    with open(self.cache_filename, "wb") as file:
+      pickle.dump((stamp, state), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+  def _set_row(self, id: int, task: Task) -> None:
+    '''Inserts or overwrites the column entries for a task.'''
+    row = self._idx.get(id)
+    if row is None:
+      self._idx[id] = len(self._ids)
+      self._ids.append(id)
+      self._titles.append(task.title)
+      self._dues.append(task.due_date)
+      self._completed.append(task.completed)
+      self._descs.append(task.description)
+      bisect.insort(self._by_title, (task.title, id))
+      bisect.insort(self._by_due, (task.due_date, id))
     else:
-      self.task_dict = {}
-    self.max_id = int(max(self.task_dict.keys())) if len(self.task_dict) > 0 else 0
+      if self._titles[row] != task.title:
+        self._discard_sorted(self._by_title, self._titles[row], id)
+        bisect.insort(self._by_title, (task.title, id))
+      if self._dues[row] != task.due_date:
+        self._discard_sorted(self._by_due, self._dues[row], id)
+        bisect.insort(self._by_due, (task.due_date, id))
+      self._titles[row] = task.title
+      self._dues[row] = task.due_date
+      self._completed[row] = task.completed
+      self._descs[row] = task.description
 
   @staticmethod
-  def datetime_serializer(obj: Any) -> str:
-    '''Helper function for TaskManager.save().'''
-    if isinstance(obj, datetime):
-      return obj.isoformat()
-    raise TypeError("Type is not serializable")
+  def _discard_sorted(order: list, key, id: int) -> None:
+    '''Removes (key, id) from a sorted order list via binary search.'''
+    del order[bisect.bisect_left(order, (key, id))]
+
+  def _pop_row(self, id: int) -> None:
+    '''Removes a task's column entries by swapping the last row into its slot. Raises an exception if called with an invalid task id.'''
+    row = self._idx.pop(id)
+    self._discard_sorted(self._by_title, self._titles[row], id)
+    self._discard_sorted(self._by_due, self._dues[row], id)
+    last = len(self._ids) - 1
+    if row != last:
+      self._ids[row] = self._ids[last]
+      self._titles[row] = self._titles[last]
+      self._dues[row] = self._dues[last]
+      self._completed[row] = self._completed[last]
+      self._descs[row] = self._descs[last]
+      self._idx[self._ids[row]] = row
+    self._ids.pop()
+    self._titles.pop()
+    self._dues.pop()
+    self._completed.pop()
+    self._descs.pop()
+
+  def task(self, id: int) -> Task:
+    '''Assembles the Task for a single id. Raises an exception if called with an invalid task id.'''
+    self._ensure_loaded()
+    row = self._idx[id]
+    return Task(
+      title=self._titles[row],
+      due_date=self._dues[row],
+      completed=bool(self._completed[row]),
+      description=self._descs[row])
+
+  def _replay_journal(self) -> None:
+    '''Applies any journaled mutations made since the last snapshot. Called once on load.'''
+    if not os.path.exists(self.journal_filename):
+      return
+    with open(self.journal_filename, "rb") as file:
+      data = file.read()  # one read of the whole journal beats buffered line-by-line chunking
+    replayed = 0  # byte offset of the last fully replayed entry
+    for line in data.split(b"\n"):
+      if line:
+        try:
+          entry = _loads(line)
+        except ValueError:  # a torn tail from a write cut short mid-flush ends the journal
+          try:
+            with open(self.journal_filename, "r+b") as file:
+              file.truncate(replayed)  # drop the tail so the next append starts on a clean line
+          except OSError:
+            pass  # recovery is best effort; a read-only install just replays up to the tear again
+          break
+        match entry["op"]:
+          case "add" | "update":
+            self._set_row(entry["id"], self._decode_task(entry["task"]))
+            if entry["id"] > self.max_id:
+              self.max_id = entry["id"]
+          case "delete":
+            if entry["id"] in self._idx:
+              self._pop_row(entry["id"])
+          case "clear":
+            self._clear_rows()
+      replayed += len(line) + 1
+
+  def _append(self, op: str, id: Optional[int] = None, task: Optional[Task] = None) -> None:
+    '''Journals a single mutation. O(1) in the number of tasks, unlike a full snapshot rewrite.'''
+    self._version += 1
+    entry: dict = {"op": op, "id": id}
+    if task is not None:
+      entry["task"] = self._encode_task(task)
+    if self._journal is None:
+      self._journal = open(self.journal_filename, "ab")
+    self._journal.write(_dumps(entry) + b"\n")
+    self._schedule_flush()
+    # once the journal outgrows the snapshot, fold it back in
+    snapshot_size = os.path.getsize(self.todo_filename) if os.path.exists(self.todo_filename) else 0
+    if self._journal.tell() > 2 * max(snapshot_size, 1024):
+      self.compact()
+
+  def _schedule_flush(self) -> None:
+    '''Flushes the journal shortly after a mutation, coalescing bursts of edits (e.g. GUI toggles) into one disk write.'''
+    with self._flush_lock:
+      if self._flush_timer is None:
+        self._flush_timer = threading.Timer(0.25, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+  def flush(self) -> None:
+    '''Forces any pending journal writes out to disk. Must be called before the process exits.'''
+    with self._flush_lock:
+      if self._flush_timer is not None:
+        self._flush_timer.cancel()
+        self._flush_timer = None
+      if self._journal is not None:
+        self._journal.flush()
+
+  def compact(self) -> None:
+    '''Rewrites the snapshot from the in-memory state and truncates the journal.'''
+    self._ensure_loaded()
+    self.flush()
+    self.save()
+    if self._journal is None:
+      self._journal = open(self.journal_filename, "ab")
+    self._journal.truncate(0)
+
+  def close(self) -> None:
+    '''Flushes pending writes and closes the journal.'''
+    self.flush()
+    if self._journal is not None:
+      self._journal.close()
+
+  def __enter__(self) -> "TaskManager":
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback) -> None:
+    self.close()
+
+  @staticmethod
+  def _encode_task(task: Task) -> dict:
+    '''Helper function for TaskManager.save(). Replaces the due date with epoch seconds plus a UTC offset, which are much cheaper to load than an ISO string.'''
+    return {
+      "title": task.title,
+      "completed": task.completed,
+      "description": task.description,
+      "due_ts": int(task.due_date.timestamp()),
+      "due_off": int(task.due_date.utcoffset().total_seconds())
+    }
+
+  @staticmethod
+  def _decode_task(encoded: dict) -> Task:
+    '''Helper function for TaskManager.__init__(). Rebuilds a Task, reconstructing the due date datetime from epoch seconds plus a UTC offset.'''
+    if "due_ts" in encoded:
+      due_date = datetime.fromtimestamp(encoded["due_ts"], tz=timezone(timedelta(seconds=encoded["due_off"])))
+    else:  # hand-edited or pre-epoch-schema entries still carry an ISO string
+      due_date = datetime.fromisoformat(encoded["due_date"])
+      if due_date.tzinfo is None:
+        due_date = due_date.astimezone()
+    return Task(
+      title=encoded["title"],
+      due_date=due_date,
+      completed=encoded["completed"],
+      description=encoded["description"])
+
+  def _clear_rows(self) -> None:
+    '''Removes all tasks' column entries.'''
+    self._ids.clear()
+    self._titles.clear()
+    self._dues.clear()
+    self._completed.clear()
+    self._descs.clear()
+    self._idx.clear()
+    self._by_title.clear()
+    self._by_due.clear()
 
   def save(self) -> None:
-    '''Save tasks to file.'''
-    with open(self.todo_filename, "w") as file:
-      json.dump(self.task_dict, file, default=self.datetime_serializer)
+    '''Write a full snapshot of all tasks to file. The write goes to a temp file first so a crash mid-write cannot corrupt the snapshot.'''
+    # an array of [id, task] pairs keeps the ids as real ints, so loading needs no int(key) conversions
+    encoded = [(id, self._encode_task(self.task(id))) for id in self._ids]
+    tmp_filename = self.todo_filename + ".tmp"
+    with open(tmp_filename, "wb") as file:
+      file.write(_dumps(encoded))
+      file.flush()
+      os.fdatasync(file.fileno())
+    os.replace(tmp_filename, self.todo_filename)
 
   def gen_id(self, id: Optional[int]) -> int:
     '''Generate a unique task id, using the given one if possible.'''
@@ -63,30 +325,46 @@ class TaskManager:
   def add_task(self, title: str, due_date: datetime, description: str = "",
                completed: bool = False, id: Optional[int] = None) -> tuple[Task, int]:
     '''Create a new task.'''
-    task: Task = {
-      "title": title,
-      "due_date": due_date,
-      "completed": completed,
-      "description": description
-    }
+    self._ensure_loaded()
+    task = Task(title=title, due_date=due_date, completed=completed, description=description)
     id_value = self.gen_id(id)
-    self.task_dict[id_value] = task
-    self.save()
+    self._set_row(id_value, task)
+    self._append("add", id_value, task)
     return task, id_value
 
   def list_tasks(self, sort_by: Optional[str] = None, completed: Optional[bool]
-                 = None, reverse: bool = False) -> dict[int, Task]:
+                 = None, reverse: bool = False) -> list[tuple[int, Task]]:
     '''Get tasks, optionally filtered by completion, and optionally sorted by either title or due date.'''
-    filtered_tasks = dict(self.task_dict)
-    if completed is not None:
-      filtered_tasks = {k: v for k, v in filtered_tasks.items() if v["completed"] == completed}
+    self._ensure_loaded()
     if sort_by == "title":
-      filtered_tasks = {k: v for k, v in sorted(filtered_tasks.items(), key=lambda item: item[1]["title"])}
+      order = self._by_title
     elif sort_by == "due_date":
-      filtered_tasks = {k: v for k, v in sorted(filtered_tasks.items(), key=lambda item: item[1]["due_date"])}
-    if reverse:
-      filtered_tasks = dict(reversed(filtered_tasks.items()))
-    return filtered_tasks
+      order = self._by_due
+    else:
+      order = None
+    if order is not None:
+      # the reversal is folded into the walk of the precomputed order rather than done as a second pass
+      ids = [id for _, id in (reversed(order) if reverse else order)]
+      if completed is not None:
+        ids = [id for id in ids if self._completed[self._idx[id]] == completed]
+    else:
+      if completed is not None:
+        # mask indexing: translate() and compress() scan the contiguous completed column at C level
+        mask = self._completed if completed else self._completed.translate(_INVERT)
+        ids = list(itertools.compress(self._ids, mask))
+        if reverse:
+          ids.reverse()
+      elif reverse:
+        ids = self._ids[::-1]
+      else:
+        ids = self._ids  # only walked read-only below, so the plain listing needs no copy
+    return [(id, self.task(id)) for id in ids]
+
+  @functools.lru_cache(maxsize=8)
+  def list_tasks_cached(self, version: int, sort_by: Optional[str], completed: Optional[bool],
+                        reverse: bool) -> tuple[tuple[int, Task], ...]:
+    '''Memoized list_tasks for the GUI. Pass self._version as version so stale results are never returned.'''
+    return tuple(self.list_tasks(sort_by, completed, reverse))
 
   def update_task(self,
                   id: int,
@@ -95,27 +373,36 @@ class TaskManager:
                   description: Optional[str] = None,
                   completed: Optional[bool] = None) -> tuple[Task, int]:
     '''Updates a task's title, due date, description, and/or completion status. Raises an exception if called with an invalid task id.'''
-    task = self.task_dict[id]
+    self._ensure_loaded()
+    row = self._idx[id]
     if title is not None:
-      task["title"] = title
+      self._discard_sorted(self._by_title, self._titles[row], id)
+      self._titles[row] = title
+      bisect.insort(self._by_title, (title, id))
     if due_date is not None:
-      task["due_date"] = due_date
+      self._discard_sorted(self._by_due, self._dues[row], id)
+      self._dues[row] = due_date
+      bisect.insort(self._by_due, (due_date, id))
     if description is not None:
-      task["description"] = description
+      self._descs[row] = description
     if completed is not None:
-      task["completed"] = completed
-    self.save()
+      self._completed[row] = completed
+    task = self.task(id)
+    self._append("update", id, task)
     return task
 
   def delete_task(self, id: int) -> None:
     '''Deletes a task. Raises an exception if called with an invalid task id.'''
-    del self.task_dict[id]
-    self.save()
+    self._ensure_loaded()
+    self._pop_row(id)
+    self._append("delete", id)
 
   def delete_all_tasks(self) -> None:
     '''Deletes all tasks.'''
-    self.task_dict = {}
-    self.save()
+    self._ensure_loaded()
+    self._clear_rows()
+    self._append("clear")
+    self.list_tasks_cached.cache_clear()  # drop references to the deleted tasks
 
   def validate_title(self, title: str) -> str:
     '''Validates that title is a non-empty string. Raises an exception if it is an empty string.'''
@@ -126,6 +413,8 @@ class TaskManager:
   def validate_due_date(self, due_date: str) -> datetime:
     '''Validates and processes due date string. Raises an exception if the string is invalid.'''
     try:
+      if not _ISO_RE.match(due_date):
+        raise ValueError
       date = datetime.fromisoformat(due_date)
       if date.tzinfo is None:  # assume timezone is same as system timezone
         date = date.astimezone()
@@ -136,59 +425,83 @@ class TaskManager:
 
   def validate_id(self, id: str) -> int:
     '''Validates a task ID. Raises an exception if the ID is not a positive integer.'''
-    try:
-      id_value = int(id)
-      if id_value <= 0:
-        raise ValueError
-      return id_value
-    except ValueError:
+    if not _ID_RE.match(id):
       raise argparse.ArgumentError(None, "Task id must be a positive integer.")
+    return int(id)
 
   def validate_unused_id(self, id: str) -> int:
     '''Validates a task ID. Raises an exception if the ID is invalid, or if the ID is already in use.'''
     id_value = self.validate_id(id)
-    if id_value in self.task_dict:
+    self._ensure_loaded()
+    if id_value in self._idx:
       raise argparse.ArgumentError(None, f"ID {id} is already in use.")
     return id_value
 
   def validate_used_id(self, id: str) -> int:
     '''Validates a task ID. Raises an exception if the ID is invalid, or if the ID is not already in use.'''
     id_value = self.validate_id(id)
-    if id_value not in self.task_dict:
+    self._ensure_loaded()
+    if id_value not in self._idx:
       raise argparse.ArgumentError(None, f"ID {id} does not match any task.")
     return id_value
 
 
-def stringify_task(task: Task, id: int) -> str:
-  '''Converts a task into a human-readable string suitable for printing to the console.'''
-  # autopep8: off
-  green_check = '\x1b[32m' + "☑" + '\033[0m'
-  red_overdue = " - " + '\033[91m' + "OVERDUE" + '\033[0m'
-  return f"""{ green_check if task["completed"] else "☐"} {task["title"]} - {id}{ red_overdue if task["due_date"] < datetime.now().astimezone() else ""}
-    Description: {task["description"]}
-    Due: {task["due_date"].strftime("%Y %b %d %H:%M:%S")}"""
-  # autopep8: on
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_CHECKED = '\x1b[32m☑\x1b[0m'
+_UNCHECKED = '☐'
+_OVERDUE = ' - \x1b[91mOVERDUE\x1b[0m'
+
+
+def _fmt_due_date(date: datetime) -> str:
+  '''Formats a due date like strftime("%Y %b %d %H:%M:%S") would, minus strftime's per-call locale and format parsing.'''
+  return f"{date.year} {_MONTHS[date.month - 1]} {date.day:02d} {date.hour:02d}:{date.minute:02d}:{date.second:02d}"
+
+
+def stringify_task(task: Task, id: int, now: Optional[datetime] = None) -> str:
+  '''Converts a task into a human-readable string suitable for printing to the console. Callers printing many tasks should compute now once and pass it in.'''
+  if now is None:
+    now = datetime.now().astimezone()
+  parts = [_CHECKED if task.completed else _UNCHECKED, " ", task.title, " - ", str(id)]
+  if task.due_date < now:
+    parts.append(_OVERDUE)
+  parts.append("\n    Description: ")
+  parts.append(task.description)
+  parts.append("\n    Due: ")
+  parts.append(_fmt_due_date(task.due_date))
+  return "".join(parts)
 
 def gui(manager: TaskManager) -> None:
   '''GUI interface of the program.'''
+  # imported here so CLI-only invocations don't pay for loading Tcl/Tk
+  import platform
+  import tkinter as tk
+  from tkinter import ttk, messagebox
+
   root = tk.Tk()
   root.title("Zolldo - To-Do List")
   root.geometry("550x1000")
   
-  # sort & filter dropdowns
+  # sort & filter dropdowns; the maps translate the displayed combobox value straight to list_tasks arguments
+  sort_map = {
+    "": (None, False),
+    "title": ("title", False),
+    "title, reversed": ("title", True),
+    "due_date": ("due_date", False),
+    "due_date, reversed": ("due_date", True)
+  }
+  filter_map = {"": None, "completed": True, "uncompleted": False}
+
   sort_frame = tk.Frame(root)
   sort_var = tk.StringVar(value="")
-  sort_options =[ "", "title", "title, reversed", "due_date", "due_date, reversed"]
   tk.Label(sort_frame, text="Sort:", width=4).pack(side="left")
-  sort_combobox = ttk.Combobox(sort_frame, textvariable=sort_var, values=sort_options, state="readonly")
+  sort_combobox = ttk.Combobox(sort_frame, textvariable=sort_var, values=list(sort_map), state="readonly")
   sort_combobox.pack(side="left")
   sort_frame.pack()
-  
+
   filter_frame = tk.Frame(root)
   filter_var = tk.StringVar(value="")
-  filter_options = [ "", "completed", "uncompleted"]
   tk.Label(filter_frame, text="Filter:", width=4).pack(side="left")
-  filter_combobox = ttk.Combobox(filter_frame, textvariable=filter_var, values=filter_options, state="readonly")
+  filter_combobox = ttk.Combobox(filter_frame, textvariable=filter_var, values=list(filter_map), state="readonly")
   filter_combobox.pack(side="left")
   filter_frame.pack()
   
@@ -202,7 +515,7 @@ def gui(manager: TaskManager) -> None:
   scrollbar = tk.Scrollbar(canvas, orient="vertical", command=canvas.yview)
   scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
   canvas.configure(yscrollcommand=scrollbar.set)
-  scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+  # the scrollregion is set once per refresh_list instead of on every <Configure> of the inner frame
   canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_frame, width=e.width))
   
   if platform.system() == "Linux":
@@ -235,7 +548,10 @@ def gui(manager: TaskManager) -> None:
   optional_input_frame.pack()
   
   checkbox_vars = {}
-  
+  row_widgets: dict[int, tk.Frame] = {}
+  row_fields: dict[int, dict[str, tk.Label]] = {}
+  row_snapshots: dict[int, Task] = {}
+
   def add_task_gui() -> None:
     '''Adds a task from the GUI.'''
     title_str = title_entry.get().strip()
@@ -255,20 +571,19 @@ def gui(manager: TaskManager) -> None:
   
   def toggle_completion_gui(id: int) -> None:
     '''Toggles a task's completion from the GUI. We use this rather than update_task because it avoids re-rendering.'''
-    manager.update_task(id, completed=not manager.task_dict[id]["completed"])
+    manager.update_task(id, completed=not manager.task(id).completed)
   
-  def delete_task_gui(id: int, frame: tk.Frame) -> None:
+  def delete_task_gui(id: int) -> None:
     '''Deletes a task from the GUI.'''
-    frame.pack_forget()
-    frame.destroy()
-    del checkbox_vars[id]
+    remove_row(id)
     manager.delete_task(id)
-  
+    # this path skips refresh_list, so recompute the scrollregion here or it scrolls into empty space
+    scrollable_frame.update_idletasks()
+    canvas.configure(scrollregion=canvas.bbox("all"))
+
   def delete_all_tasks_gui() -> None:
     '''Deletes all tasks from the GUI.'''
     if messagebox.askyesno("Confirm", "Are you sure you want to delete all tasks?"):
-      for id in checkbox_vars:
-        del checkbox_vars[id]
       manager.delete_all_tasks()
       refresh_list()
   
@@ -279,8 +594,8 @@ def gui(manager: TaskManager) -> None:
   delete_all_button.pack()
   
   def edit_task_field(id: int, field: str, entry: tk.Entry) -> None:
-    '''Replaces a label with an entry widget for editing.'''
-    
+    '''Validates and applies an edited field value from an entry widget.'''
+
     new_value = entry.get().strip()
     
     try:
@@ -293,65 +608,110 @@ def gui(manager: TaskManager) -> None:
           manager.update_task(id, description=new_value)
     except argparse.ArgumentError as e:
       entry.delete(0, tk.END)
-      entry.insert(0, manager.task_dict[id][field])
+      entry.insert(0, getattr(manager.task(id), field))
       messagebox.showerror("Error", str(e))
       
 
+  def build_row(id: int, task: Task, now: datetime) -> tk.Frame:
+    '''Builds the widget row for a single task. Packing is left to refresh_list, which packs rows in display order.'''
+    frame = tk.Frame(scrollable_frame)
+    frame.columnconfigure(0, weight=1)
+    frame.columnconfigure(1, weight=1)
+    frame.columnconfigure(2, weight=6)
+    frame.columnconfigure(3, weight=6)
+    frame.columnconfigure(4, weight=1)
+
+    # checkbox
+    checkbox_vars[id] = tk.BooleanVar(value=task.completed)
+    checkbox = tk.Checkbutton(frame, variable=checkbox_vars[id], command=lambda id=id: toggle_completion_gui(id))
+    checkbox.grid(row=0, column=0)
+
+    # ID
+    tk.Label(frame, text=f"{id}").grid(row=0, column=1)
+
+    # title, due date, description: plain labels, swapped for an Entry on click (Entry widgets are far heavier)
+    title_label = tk.Label(frame, text=task.title, anchor="w")
+    title_label.grid(row=0, column=2, sticky=tk.EW)
+    title_label.bind("<Button-1>", lambda e, id=id, label=title_label: start_edit_gui(id, "title", label))
+
+    due_date_label = tk.Label(frame, text=task.due_date, anchor="w")
+    if task.due_date < now:
+      due_date_label.config(fg="red")
+    due_date_label.grid(row=0, column=3, sticky=tk.EW)
+    due_date_label.bind("<Button-1>", lambda e, id=id, label=due_date_label: start_edit_gui(id, "due_date", label))
+
+    # delete button
+    delete_button = tk.Button(frame, text="X", fg="red", command=lambda id=id: delete_task_gui(id))
+    delete_button.grid(row=0, column=4, padx=10)
+
+    desc_label = tk.Label(frame, text=task.description, anchor="w")
+    desc_label.grid(row=1, column=2, rowspan=3, columnspan=2, pady=2, sticky=tk.NSEW)
+    desc_label.bind("<Button-1>", lambda e, id=id, label=desc_label: start_edit_gui(id, "description", label))
+
+    row_fields[id] = {"title": title_label, "due_date": due_date_label, "description": desc_label}
+    return frame
+
+  def start_edit_gui(id: int, field: str, label: tk.Label) -> None:
+    '''Swaps a display label for a temporary entry widget so the field can be edited.'''
+    grid_info = label.grid_info()
+    label.grid_remove()
+    entry = tk.Entry(label.master)
+    entry.insert(0, label.cget("text"))
+    entry.grid(row=grid_info["row"], column=grid_info["column"], rowspan=grid_info["rowspan"],
+               columnspan=grid_info["columnspan"], pady=grid_info["pady"], sticky=grid_info["sticky"])
+    entry.focus_set()
+
+    def finish_edit_gui(event: "tk.Event") -> None:
+      '''Applies the edit, then destroys the entry and restores the label.'''
+      if not entry.winfo_exists():  # destroying the entry below re-fires <FocusOut>
+        return
+      edit_task_field(id, field, entry)
+      label.config(text=getattr(manager.task(id), field))
+      entry.destroy()
+      label.grid()
+
+    entry.bind("<Return>",   finish_edit_gui)
+    entry.bind("<FocusOut>", finish_edit_gui)
+
+  def update_row(id: int, task: Task, now: datetime) -> None:
+    '''Refreshes an existing row's widgets in place after its task changed.'''
+    checkbox_vars[id].set(task.completed)
+    for field in ("title", "due_date", "description"):
+      row_fields[id][field].config(text=getattr(task, field))
+    row_fields[id]["due_date"].config(fg="red" if task.due_date < now else "black")
+
+  def remove_row(id: int) -> None:
+    '''Destroys the widget row for a single task.'''
+    row_widgets.pop(id).destroy()
+    del row_fields[id]
+    del checkbox_vars[id]
+    del row_snapshots[id]
+
   def refresh_list() -> None:
-    '''Display tasks on the GUI.'''
-    for widget in scrollable_frame.winfo_children():
-      widget.destroy()
-    
-    sort_split = sort_var.get().split(",")
-    sort_by = sort_split[0] if len(sort_split) > 0 else None
-    reverse = sort_split[1] == " reversed" if len(sort_split) > 1 else False
-    filter_value = filter_var.get()
-    completed = None if filter_value  == "" else filter_value == filter_options[1] # "completed"
-    tasks = manager.list_tasks(sort_by, completed, reverse)
-    for id, task in tasks.items():
-      frame = tk.Frame(scrollable_frame)
-      frame.pack(fill="x", pady=2)
-      frame.columnconfigure(0, weight=1)
-      frame.columnconfigure(1, weight=1)
-      frame.columnconfigure(2, weight=6)
-      frame.columnconfigure(3, weight=6)
-      frame.columnconfigure(4, weight=1)
-      
-      # checkbox
-      checkbox_vars[id] = tk.BooleanVar(value=task["completed"])
-      checkbox = tk.Checkbutton(frame, variable=checkbox_vars[id], command=lambda id=id: toggle_completion_gui(id))
-      checkbox.grid(row=0, column=0)
-      
-      # ID
-      tk.Label(frame, text=f"{id}").grid(row=0, column=1)
-      
-      # title
-      title_label = tk.Entry(frame)
-      title_label.insert(0, task["title"])
-      title_label.grid(row=0, column=2, sticky=tk.EW)
-      title_label.bind("<Return>",   lambda e, id=id, entry=title_label: edit_task_field(id, "title", entry))
-      title_label.bind("<FocusOut>", lambda e, id=id, entry=title_label: edit_task_field(id, "title", entry))
-      
-      # due date
-      due_date_label = tk.Entry(frame)
-      due_date_label.insert(0, task["due_date"])
-      if task["due_date"] < datetime.now().astimezone():
-        due_date_label.config(fg="red")
-      due_date_label.grid(row=0, column=3, sticky=tk.EW)
-      due_date_label.bind("<Return>",   lambda e, id=id, entry=due_date_label: edit_task_field(id, "due_date", entry))
-      due_date_label.bind("<FocusOut>", lambda e, id=id, entry=due_date_label: edit_task_field(id, "due_date", entry))
-      
-      # delete button
-      delete_button = tk.Button(frame, text="X", fg="red", command=lambda id=id, frame=frame: delete_task_gui(id, frame))
-      delete_button.grid(row=0, column=4, padx=10)
-      
-      # description
-      desc_label = tk.Entry(frame)
-      desc_label.insert(0, task["description"])
-      desc_label.grid(row=1, column=2, rowspan=3, columnspan=2, pady=2, sticky=tk.NSEW)
-      desc_label.bind("<Return>",   lambda e, id=id, entry=desc_label: edit_task_field(id, "description", entry))
-      desc_label.bind("<FocusOut>", lambda e, id=id, entry=desc_label: edit_task_field(id, "description", entry))
-  
+    '''Display tasks on the GUI. Rather than rebuilding every row, only rows whose task changed are touched.'''
+    sort_by, reverse = sort_map[sort_var.get()]
+    completed = filter_map[filter_var.get()]
+    tasks = manager.list_tasks_cached(manager._version, sort_by, completed, reverse)
+    now = datetime.now().astimezone()
+
+    kept_ids = {id for id, task in tasks}
+    for id in [id for id in row_widgets if id not in kept_ids]:
+      remove_row(id)
+    # suspend geometry propagation while rows are (re)packed so tk computes one relayout instead of one per row
+    scrollable_frame.pack_propagate(False)
+    for id, task in tasks:
+      if id not in row_widgets:
+        row_widgets[id] = build_row(id, task, now)
+      elif row_snapshots[id] != task:
+        update_row(id, task, now)
+      row_snapshots[id] = task  # task() builds a fresh Task per call, so the snapshot can't alias later mutations
+      # repack in display order; tkinter stacks frames in pack order
+      row_widgets[id].pack_forget()
+      row_widgets[id].pack(fill="x", pady=2)
+    scrollable_frame.pack_propagate(True)
+    scrollable_frame.update_idletasks()
+    canvas.configure(scrollregion=canvas.bbox("all"))
+
   def clear_inputs() -> None:
     '''Clears the input fields.'''
     
@@ -368,71 +728,97 @@ def gui(manager: TaskManager) -> None:
   sort_combobox.bind(  "<<ComboboxSelected>>", lambda e: refresh_list())
   filter_combobox.bind("<<ComboboxSelected>>", lambda e: refresh_list())
   
+  def on_close() -> None:
+    '''Flushes pending writes before the window closes.'''
+    manager.flush()
+    root.destroy()
+
+  root.protocol("WM_DELETE_WINDOW", on_close)
+
   refresh_list()
   root.mainloop()
 
 def cli() -> None:
   '''CLI interface of the program.'''
-  manager = TaskManager()
-  parser = argparse.ArgumentParser(
-    prog="zolldo",
-    description="A lightweight todo-list application CLI")
-  subparsers = parser.add_subparsers(dest="command", required=True)
-
-  # autopep8: off
-  # add
-  add_parser = subparsers.add_parser("add", help="Add a new to-do task.")
-  add_parser.add_argument("--title",                required=True, type=manager.validate_title,                   help="Title of the task.")
-  add_parser.add_argument("--due_date",             required=True, type=manager.validate_due_date,                help="Due date (format: any ISO datetime string such as 1970-01-01 or 1970-01-01T00:00).")
-  add_parser.add_argument("--description",          required=False,type=str,                        default="",   help="Description of the task.")
-  add_parser.add_argument("--id",                   required=False,type=manager.validate_unused_id, default=None, help="Specify a unique ID for the task.")
-  add_completed_group = add_parser.add_mutually_exclusive_group()
-  add_completed_group.add_argument("--completed",   required=False,action="store_true", dest="completed",         help="Mark task as completed.")
-  add_completed_group.add_argument("--uncompleted", required=False,action="store_false",dest="completed",         help="Mark task as uncompleted (default).")
-  add_completed_group.set_defaults(completed=False)
-
-  # list
-  list_parser = subparsers.add_parser("list", help="List all tasks.")
-  list_parser.add_argument("--sort_by",               required=False, choices=["title", "due_date"],          help="Sort tasks by title or due date.")
-  list_parser.add_argument("--reverse",               required=False, action="store_true", default=False,     help="Reverse the order of tasks displayed.")
-  list_completed_group = list_parser.add_mutually_exclusive_group()
-  list_completed_group.add_argument("--completed",    required=False, action="store_true", dest="completed",  help="Show only completed tasks.")
-  list_completed_group.add_argument("--uncompleted",  required=False, action="store_false",dest="completed",  help="Show only uncompleted tasks.")
-  list_completed_group.set_defaults(completed=None)
-
-  # update
-  update_parser = subparsers.add_parser("update", help="Update a task.")
-  update_parser.add_argument("--id",                    required=True, type=manager.validate_used_id,           help="ID of the task to update.")
-  update_parser.add_argument("--title",                 required=False,type=manager.validate_title,             help="New title of the task.")
-  update_parser.add_argument("--due_date",              required=False,type=manager.validate_due_date,          help="New due date (format: any ISO datetime string such as 1970-01-01 or 1970-01-01T00:00).")
-  update_parser.add_argument("--description",           required=False,type=str,                                help="New description of the task.")
-  update_completed_group = update_parser.add_mutually_exclusive_group()
-  update_completed_group.add_argument("--completed",    required=False,action="store_true",  dest="completed",  help="Mark task as completed.")
-  update_completed_group.add_argument("--uncompleted",  required=False,action="store_false", dest="completed",  help="Mark task as uncompleted.")
-  update_completed_group.set_defaults(completed=None)
-
-  # delete
-  delete_parser = subparsers.add_parser("delete", help="Delete a task.")
-  delete_group = delete_parser.add_mutually_exclusive_group(required=True)
-  delete_group.add_argument("--id",  type=manager.validate_used_id, help="ID of the task to delete.")
-  delete_group.add_argument("--all", action="store_true",           help="Delete all tasks.")
-  
-  # gui
-  gui_parser = subparsers.add_parser("gui", help="Interact with your To-Do list using a GUI.")
-  # autopep8: on
-  args = parser.parse_args()
+  with TaskManager() as manager:
+    parser = argparse.ArgumentParser(
+      prog="zolldo",
+      description="A lightweight todo-list application CLI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
 
-  match args.command:
-    case "add":
+    # resolve the bound validators once; argparse then calls plain locals with no attribute lookup per arg
+    validate_title = manager.validate_title
+    validate_due_date = manager.validate_due_date
+    validate_unused_id = manager.validate_unused_id
+    validate_used_id = manager.validate_used_id
+
+    # autopep8: off
+    def build_add() -> None:
+      add_parser = subparsers.add_parser("add", help="Add a new to-do task.")
+      add_parser.add_argument("--title",                required=True, type=validate_title,                   help="Title of the task.")
+      add_parser.add_argument("--due_date",             required=True, type=validate_due_date,                help="Due date (format: any ISO datetime string such as 1970-01-01 or 1970-01-01T00:00).")
+      add_parser.add_argument("--description",          required=False,type=str,                        default="",   help="Description of the task.")
+      add_parser.add_argument("--id",                   required=False,type=validate_unused_id, default=None, help="Specify a unique ID for the task.")
+      add_completed_group = add_parser.add_mutually_exclusive_group()
+      add_completed_group.add_argument("--completed",   required=False,action="store_true", dest="completed",         help="Mark task as completed.")
+      add_completed_group.add_argument("--uncompleted", required=False,action="store_false",dest="completed",         help="Mark task as uncompleted (default).")
+      add_completed_group.set_defaults(completed=False)
+
+    def build_list() -> None:
+      list_parser = subparsers.add_parser("list", help="List all tasks.")
+      list_parser.add_argument("--sort_by",               required=False, choices=["title", "due_date"],          help="Sort tasks by title or due date.")
+      list_parser.add_argument("--reverse",               required=False, action="store_true", default=False,     help="Reverse the order of tasks displayed.")
+      list_completed_group = list_parser.add_mutually_exclusive_group()
+      list_completed_group.add_argument("--completed",    required=False, action="store_true", dest="completed",  help="Show only completed tasks.")
+      list_completed_group.add_argument("--uncompleted",  required=False, action="store_false",dest="completed",  help="Show only uncompleted tasks.")
+      list_completed_group.set_defaults(completed=None)
+
+    def build_update() -> None:
+      update_parser = subparsers.add_parser("update", help="Update a task.")
+      update_parser.add_argument("--id",                    required=True, type=validate_used_id,           help="ID of the task to update.")
+      update_parser.add_argument("--title",                 required=False,type=validate_title,             help="New title of the task.")
+      update_parser.add_argument("--due_date",              required=False,type=validate_due_date,          help="New due date (format: any ISO datetime string such as 1970-01-01 or 1970-01-01T00:00).")
+      update_parser.add_argument("--description",           required=False,type=str,                                help="New description of the task.")
+      update_completed_group = update_parser.add_mutually_exclusive_group()
+      update_completed_group.add_argument("--completed",    required=False,action="store_true",  dest="completed",  help="Mark task as completed.")
+      update_completed_group.add_argument("--uncompleted",  required=False,action="store_false", dest="completed",  help="Mark task as uncompleted.")
+      update_completed_group.set_defaults(completed=None)
+
+    def build_delete() -> None:
+      delete_parser = subparsers.add_parser("delete", help="Delete a task.")
+      delete_group = delete_parser.add_mutually_exclusive_group(required=True)
+      delete_group.add_argument("--id",  type=validate_used_id, help="ID of the task to delete.")
+      delete_group.add_argument("--all", action="store_true",           help="Delete all tasks.")
+
+    def build_gui() -> None:
+      subparsers.add_parser("gui", help="Interact with your To-Do list using a GUI.")
+    # autopep8: on
+
+    builders = {"add": build_add, "list": build_list, "update": build_update,
+                "delete": build_delete, "gui": build_gui}
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in builders:
+      builders[command]()  # only the requested subparser is worth constructing
+    else:  # --help, no command, or a typo: build them all so argparse can list the choices
+      for build in builders.values():
+        build()
+    args = parser.parse_args()
+
+    def do_add(args) -> None:
       task, id = manager.add_task(title=args.title, due_date=args.due_date,
                                   description=args.description, completed=args.completed, id=args.id)
       print(f"""Task successfully added:
   {stringify_task(task, id)}""")
-    case "list":
+
+    def do_list(args) -> None:
       tasks = manager.list_tasks(sort_by=args.sort_by, completed=args.completed, reverse=args.reverse)
-      for id, task in tasks.items():
-        print(stringify_task(task, id))
-    case "update":
+      now = datetime.now().astimezone()
+      # one write() for the whole listing instead of a syscall per task
+      output = "\n".join(stringify_task(task, id, now) for id, task in tasks)
+      if output:
+        sys.stdout.write(output + "\n")
+
+    def do_update(args) -> None:
       task = manager.update_task(
           id=args.id,
           title=args.title,
@@ -441,15 +827,22 @@ def cli() -> None:
           completed=args.completed)
       print(f"""Task successfully updated:
   {stringify_task(task, args.id)}""")
-    case "delete":
+
+    def do_delete(args) -> None:
       if args.all and input("are you sure? (y/n)") == "y":
         manager.delete_all_tasks()
         print("Successfully deleted all tasks.")
       elif args.id:
         manager.delete_task(args.id)
         print(f"Successfully deleted task {args.id}")
-    case "gui":
+
+    def do_gui(args) -> None:
       gui(manager=manager)
 
+    # dict dispatch: one hashed lookup instead of comparing args.command against each case in turn
+    handlers = {"add": do_add, "list": do_list, "update": do_update,
+                "delete": do_delete, "gui": do_gui}
+    handlers[args.command](args)
+
 if __name__ == "__main__":
   cli()